@@ -0,0 +1,29 @@
+"""
+Per process cache for parallel BDD runs
+
+behavex runs behave once per scenario inside each of its worker processes,
+and behave executes environment.py again on every run. Anything that
+should last as long as the worker process, like the browser or a private
+copy of the service, is cached here instead because this module is
+imported normally and stays loaded between runs.
+"""
+import os
+from multiprocessing.util import Finalize
+
+_cache = {}
+
+
+def process_singleton(name, create, release):
+    """Returns the named resource for this process, creating it on first use
+
+    release(resource) is called when the process exits. multiprocessing
+    workers leave through os._exit(), which skips atexit handlers, so the
+    clean up is registered as a multiprocessing finalizer instead. Those
+    run at exit in both pool workers and the main process.
+    """
+    key = (os.getpid(), name)
+    if key not in _cache:
+        resource = create()
+        _cache[key] = resource
+        Finalize(None, release, args=(resource,), exitpriority=10)
+    return _cache[key]
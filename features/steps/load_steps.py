@@ -22,22 +22,35 @@ Steps file for products.feature
 For information on Waiting until elements are present in the HTML see:
     https://selenium-python.readthedocs.io/waits.html
 """
+from os import getenv
 from behave import given
 import requests
-from service import status
+from requests.adapters import HTTPAdapter
+from service.common import status
+
+# Size of the keep-alive connection pool shared by all steps
+POOL_SIZE = int(getenv('POOL_SIZE', '32'))
+
+# One session for the whole run so connections are reused between requests
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+_session.headers.update({"Connection": "keep-alive"})
+
 
 @given('the following products exist:')
 def step_impl(context):
-    # clear out any existing
-    requests.delete(context.base_url + "/products")
-    # load each row
-    for row in context.table:
-        payload = {
+    """Delete all Products and load new ones"""
+    # clear out any existing and load all of the rows with a single request
+    payloads = [
+        {
             "name":        row['name'],
             "description": row['description'],
             "price":       float(row['price']),
             "available":   row['available'].lower() in ("true","1"),
             "category":    row['category']
         }
-        resp = requests.post(context.base_url + "/products", json=payload)
-        assert resp.status_code == status.HTTP_201_CREATED
+        for row in context.table
+    ]
+    resp = _session.post(context.base_url + "/products/_reset_and_load", json=payloads)
+    assert resp.status_code == status.HTTP_201_CREATED
@@ -25,53 +25,106 @@ For information on Waiting until elements are present in the HTML see:
     https://selenium-python.readthedocs.io/waits.html
 """
 import logging
+from functools import lru_cache
 from behave import when, then
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select, WebDriverWait
-from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support import expected_conditions as EC
 
 ID_PREFIX = 'product_'
+# Paths of the pages the steps can visit by name, extend for new pages
+PAGE_URLS = {
+    "home page": "",
+}
+RESULTS = (By.ID, 'search_results')
+FLASH_MESSAGE = (By.ID, 'flash_message')
+
+# Remembers the search results markup of a freshly loaded page so that
+# RESET_PAGE_SCRIPT can put it back later.
+SAVE_PAGE_SCRIPT = """
+window.initialResults = document.getElementById('search_results').innerHTML;
+"""
+
+# Puts an already loaded page back the way it was when first loaded and
+# returns true, or returns false when the page has to be loaded again
+# because it is still loading, was never saved, or has AJAX calls from
+# the previous scenario in flight. The Clear button cannot be used for
+# this because it leaves the dropdowns with nothing selected instead of
+# their default options.
+RESET_PAGE_SCRIPT = """
+if (document.readyState !== 'complete' || window.initialResults === undefined
+        || !window.jQuery || jQuery.active !== 0) {
+    return false;
+}
+document.querySelectorAll('input').forEach(function (input) {
+    input.value = input.defaultValue;
+});
+document.querySelectorAll('select').forEach(function (select) {
+    const index = Array.from(select.options).findIndex(function (option) {
+        return option.defaultSelected;
+    });
+    select.selectedIndex = Math.max(index, 0);
+});
+document.getElementById('flash_message').innerHTML = '';
+document.getElementById('search_results').innerHTML = window.initialResults;
+return true;
+"""
+
+
+@lru_cache(maxsize=128)
+def _loc(name, prefix="", suffix=""):
+    """Returns the By.ID locator for an element from its name in a step"""
+    return (By.ID, f"{prefix}{name.lower().replace(' ', '_')}{suffix}")
+
+
+def _find(context, locator):
+    """Wait for an element to be present and return it"""
+    return context.wait.until(EC.presence_of_element_located(locator))
 
 
 @when('I visit the "{page}" Page')
 def step_visit_page(context, page):
     """Navigate to a named page"""
-    if page.lower() == "home page":
-        context.driver.get(context.base_url)
-    else:
-        # extend for other pages by name if needed
-        context.driver.get(context.base_url + "/" + page.replace(" ", "_").lower())
+    path = PAGE_URLS.get(page.lower())
+    assert path is not None, f"Unknown page '{page}'"
+    url = context.base_url + path
+    driver = context.driver
+    # already on the page so reset it rather than loading it all again
+    if driver.current_url.rstrip("/") == url.rstrip("/") and driver.execute_script(RESET_PAGE_SCRIPT):
+        return
+    driver.get(url)
+    driver.execute_script(SAVE_PAGE_SCRIPT)
 
 @when('I set the "{field}" to "{value}"')
 def step_set_field(context, field, value):
     """Set the value of an input field by its label name"""
-    elem = context.driver.find_element_by_id(f"{field.lower()}-input")
+    elem = _find(context, _loc(field, ID_PREFIX))
     elem.clear()
     elem.send_keys(value)
 
 @when('I select "{option}" in the "{dropdown}" dropdown')
 def step_select_dropdown(context, option, dropdown):
     """Select an option in a select element"""
-    elem = context.driver.find_element_by_id(f"{dropdown.lower()}-dropdown")
+    elem = _find(context, _loc(dropdown, ID_PREFIX))
     select = Select(elem)
     select.select_by_visible_text(option)
 
 @when('I press the "{button}" button')
 def step_press_button(context, button):
     """Click a button by its name"""
-    btn = context.driver.find_element_by_id(f"{button.lower()}-btn")
+    btn = _find(context, _loc(button, suffix="-btn"))
     btn.click()
 
 @when('I copy the "{field}" field')
 def step_copy_field(context, field):
     """Copy the value of a field into context.clipboard"""
-    elem = context.driver.find_element_by_id(f"{field.lower()}-input")
+    elem = _find(context, _loc(field, ID_PREFIX))
     context.clipboard = elem.get_attribute("value")
 
 @when('I paste the "{field}" field')
 def step_paste_field(context, field):
     """Paste the stored clipboard value into a field"""
-    elem = context.driver.find_element_by_id(f"{field.lower()}-input")
+    elem = _find(context, _loc(field, ID_PREFIX))
     elem.clear()
     elem.send_keys(context.clipboard)
 
@@ -84,28 +137,28 @@ def step_change_field(context, field, value):
 @then('I should see "{text}" in the results')
 def step_see_in_results(context, text):
     """Assert that text appears in the search results container"""
-    found = WebDriverWait(context.driver, context.wait_seconds).until(
-        EC.text_to_be_present_in_element((By.ID, 'search_results'), text)
+    found = context.wait.until(
+        EC.text_to_be_present_in_element(RESULTS, text)
     )
     assert found, f"Expected '{text}' to be in results"
 
 @then('I should not see "{text}" in the results')
 def step_not_see_in_results(context, text):
     """Assert that text does not appear in the search results"""
-    elem = context.driver.find_element_by_id('search_results')
+    elem = _find(context, RESULTS)
     assert text not in elem.text, f"Did not expect '{text}' in results"
 
 @then('I should see the message "{message}"')
 def step_see_message(context, message):
     """Assert that a flash message appears"""
-    found = WebDriverWait(context.driver, context.wait_seconds).until(
-        EC.text_to_be_present_in_element((By.ID, 'flash_message'), message)
+    found = context.wait.until(
+        EC.text_to_be_present_in_element(FLASH_MESSAGE, message)
     )
     assert found, f"Expected flash message '{message}'"
 
 @then('I should see "{value}" in the "{field}" field')
 def step_field_value(context, value, field):
     """Assert that an input field shows a given value"""
-    elem = context.driver.find_element_by_id(f"{field.lower()}-input")
+    elem = _find(context, _loc(field, ID_PREFIX))
     actual = elem.get_attribute('value')
     assert actual == value, f"Expected {field}='{value}', but got '{actual}'"
\ No newline at end of file
@@ -33,6 +33,7 @@ from enum import Enum
 from decimal import Decimal
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
 
 logger = logging.getLogger("flask.app")
 
@@ -169,6 +170,27 @@ class Product(db.Model):
         app.app_context().push()
         db.create_all()  # make our sqlalchemy tables
 
+    @classmethod
+    def replace_all(cls, products: list):
+        """Replaces every Product in the database in a single transaction
+
+        The table is truncated and its id sequence restarted on PostgreSQL,
+        other databases fall back to deleting all of the rows
+
+        :param products: the Products to save in place of the current ones
+        :type products: list
+
+        """
+        logger.info("Replacing all Products with %d new ones", len(products))
+        if db.engine.dialect.name == "postgresql":
+            db.session.execute(text(f"TRUNCATE {cls.__tablename__} RESTART IDENTITY"))
+        else:
+            db.session.query(cls).delete()
+        for product in products:
+            product.id = None  # pylint: disable=invalid-name
+        db.session.bulk_save_objects(products, return_defaults=True)
+        db.session.commit()
+
     @classmethod
     def all(cls) -> list:
         """Returns all of the Products in the database"""
@@ -247,3 +269,4 @@ class Product(db.Model):
         """
         logger.info("Processing category query for %s ...", category.name)
         return cls.query.filter(cls.category == category)
+
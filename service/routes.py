@@ -20,7 +20,7 @@ Product Store Service with UI
 """
 from flask import jsonify, request, abort
 from flask import url_for  # noqa: F401 pylint: disable=unused-import
-from service.models import Product
+from service.models import Product, Category
 from service.common import status  # HTTP Status Codes
 from . import app
 
@@ -93,6 +93,31 @@ def create_products():
     location_url = "/"  # delete once READ is implemented
     return jsonify(message), status.HTTP_201_CREATED, {"Location": location_url}
 
+
+######################################################################
+# R E S E T   A N D   L O A D   P R O D U C T S   (TEST ONLY)
+######################################################################
+@app.route("/products/_reset_and_load", methods=["POST"])
+def reset_and_load_products():
+    """
+    Replaces all Products
+    This endpoint is only available with ENABLE_TEST_ENDPOINTS and lets the BDD tests
+    clear the table and load their data in a single transaction
+    """
+    if not app.config["ENABLE_TEST_ENDPOINTS"]:
+        abort(status.HTTP_404_NOT_FOUND)
+    app.logger.info("Request to Reset and Load Products...")
+    check_content_type("application/json")
+
+    data = request.get_json()
+    if not isinstance(data, list):
+        abort(status.HTTP_400_BAD_REQUEST, "Request body must be a list of Products")
+    products = [Product().deserialize(item) for item in data]
+    Product.replace_all(products)
+    app.logger.info("Reset and loaded %d Products", len(products))
+
+    return jsonify([product.serialize() for product in products]), status.HTTP_201_CREATED
+
 @app.route("/products/<int:product_id>", methods=["GET"])
 def get_product(product_id):
     product = Product.find(product_id)
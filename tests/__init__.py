@@ -0,0 +1,93 @@
+"""
+Test package for the Product service
+
+Helpers shared by the test modules live here
+"""
+import os
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+# Set by pytest-xdist to gw0, gw1, ... when the suite runs with pytest -n
+XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER")
+
+
+def use_worker_schema(app):
+    """Gives each pytest-xdist worker its own PostgreSQL schema
+
+    Call this after SQLALCHEMY_DATABASE_URI is set and before init_db()
+    so parallel workers never create or delete each other's rows. It does
+    nothing for serial runs or non PostgreSQL databases.
+    """
+    database_uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    if not XDIST_WORKER or not database_uri.startswith("postgresql"):
+        return
+    schema = f"test_{XDIST_WORKER}"
+    engine = create_engine(database_uri)
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+    engine.dispose()
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "connect_args": {"options": f"-csearch_path={schema}"}
+    }
+
+
+def drop_worker_schemas(database_uri, workers):
+    """Drops the schemas that use_worker_schema() created for the given xdist workers"""
+    if not workers or not database_uri.startswith("postgresql"):
+        return
+    engine = create_engine(database_uri)
+    with engine.begin() as connection:
+        for worker in workers:
+            connection.execute(text(f"DROP SCHEMA IF EXISTS test_{worker} CASCADE"))
+    engine.dispose()
+
+
+def _sqlite_connect(dbapi_connection, connection_record):  # pylint: disable=unused-argument
+    """Stops pysqlite from managing transactions itself"""
+    dbapi_connection.isolation_level = None
+
+
+def _sqlite_begin(connection):
+    """Emits the BEGIN that pysqlite would otherwise leave out"""
+    connection.exec_driver_sql("BEGIN")
+
+
+def _fix_sqlite_transactions(engine):
+    """Makes SAVEPOINTs work on SQLite, which pysqlite breaks by default
+
+    See "Serializable isolation / Savepoints / Transactional DDL" in the
+    SQLAlchemy SQLite dialect documentation.
+    """
+    if engine.dialect.name != "sqlite" or event.contains(engine, "begin", _sqlite_begin):
+        return
+    event.listen(engine, "connect", _sqlite_connect)
+    event.listen(engine, "begin", _sqlite_begin)
+    engine.dispose()  # so the pooled connections are made again with the hooks
+
+
+def begin_rollback_session(db):
+    """Points db.session at a transaction that is never committed
+
+    Commits made by the code under test only release a SAVEPOINT inside
+    the outer transaction, so end_rollback_session() can throw all of a
+    test's changes away with a single rollback.
+
+    :return: the state to hand back to end_rollback_session()
+    """
+    _fix_sqlite_transactions(db.engine)
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    original_session = db.session
+    db.session = scoped_session(
+        sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
+    )
+    return connection, transaction, original_session
+
+
+def end_rollback_session(db, state):
+    """Rolls back everything since begin_rollback_session() and restores db.session"""
+    connection, transaction, original_session = state
+    db.session.remove()
+    transaction.rollback()
+    connection.close()
+    db.session = original_session
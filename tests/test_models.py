@@ -29,6 +29,7 @@ import unittest
 from decimal import Decimal
 from service.models import Product, Category, db
 from service import app
+from tests import use_worker_schema, begin_rollback_session, end_rollback_session
 from tests.factories import ProductFactory
 
 DATABASE_URI = os.getenv(
@@ -49,8 +50,11 @@ class TestProductModel(unittest.TestCase):
         app.config["TESTING"] = True
         app.config["DEBUG"] = False
         app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
+        use_worker_schema(app)
         app.logger.setLevel(logging.CRITICAL)
         Product.init_db(app)
+        db.session.query(Product).delete()  # clean up earlier runs once
+        db.session.commit()
 
     @classmethod
     def tearDownClass(cls):
@@ -59,12 +63,11 @@ class TestProductModel(unittest.TestCase):
 
     def setUp(self):
         """This runs before each test"""
-        db.session.query(Product).delete()  # clean up the last tests
-        db.session.commit()
+        self.rollback_state = begin_rollback_session(db)
 
     def tearDown(self):
         """This runs after each test"""
-        db.session.remove()
+        end_rollback_session(db, self.rollback_state)
 
     ######################################################################
     #  T E S T   C A S E S
@@ -148,4 +151,5 @@ class TestProductModel(unittest.TestCase):
         for p in prods: p.create()
         avail = prods[0].available
         found = Product.find_by_availability(avail)
-        self.assertTrue(all(p.available == avail for p in found))
\ No newline at end of file
+        self.assertTrue(all(p.available == avail for p in found))
+
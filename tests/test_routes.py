@@ -27,11 +27,13 @@ Test cases can be run with the following:
 import os
 import logging
 from decimal import Decimal
+from urllib.parse import quote_plus
+from functools import lru_cache
 from unittest import TestCase
 from service import app
 from service.common import status
-from service.models import db, init_db, Product
-from tests.factories import ProductFactory
+from service.models import db, init_db, Product, Category
+from tests import use_worker_schema, begin_rollback_session, end_rollback_session
 
 # Disable all but critical errors during normal test run
 # uncomment for debugging failing tests
@@ -43,6 +45,23 @@ DATABASE_URI = os.getenv(
 )
 BASE_URL = "/products"
 
+# Cheap payload for tests that never look at the Product fields
+PLAIN_PRODUCT = Product(
+    name="p", description="d", price=Decimal("1"), available=True, category=Category.UNKNOWN
+)
+
+
+@lru_cache(maxsize=None)
+def product_factory():
+    """Imports the ProductFactory, and Faker with it, the first time a test needs it"""
+    # pylint: disable=import-outside-toplevel
+    import factory
+    from tests.factories import ProductFactory
+
+    # Seed the fuzzy attributes and Faker once so test data is repeatable
+    factory.random.reseed_random(42)
+    return ProductFactory
+
 
 ######################################################################
 #  T E S T   C A S E S
@@ -55,11 +74,18 @@ class TestProductRoutes(TestCase):
     def setUpClass(cls):
         """Run once before all tests"""
         app.config["TESTING"] = True
+        app.config["ENABLE_TEST_ENDPOINTS"] = True
         app.config["DEBUG"] = False
         # Set up the test database
         app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
+        use_worker_schema(app)
         app.logger.setLevel(logging.CRITICAL)
         init_db(app)
+        db.session.query(Product).delete()  # clean up earlier runs once
+        db.session.commit()
+        # init_db() has already pushed the app context the tests share,
+        # so only the test client is created once here
+        cls._client = app.test_client()
 
     @classmethod
     def tearDownClass(cls):
@@ -68,12 +94,11 @@ class TestProductRoutes(TestCase):
 
     def setUp(self):
         """Runs before each test"""
-        self.client = app.test_client()
-        db.session.query(Product).delete()  # clean up the last tests
-        db.session.commit()
+        self.client = self._client
+        self.rollback_state = begin_rollback_session(db)
 
     def tearDown(self):
-        db.session.remove()
+        end_rollback_session(db, self.rollback_state)
 
     ############################################################
     # Utility function to bulk create products
@@ -81,8 +106,7 @@ class TestProductRoutes(TestCase):
     def _create_products(self, count: int = 1) -> list:
         """Factory method to create products in bulk"""
         products = []
-        for _ in range(count):
-            test_product = ProductFactory()
+        for test_product in product_factory().build_batch(count):
             response = self.client.post(BASE_URL, json=test_product.serialize())
             self.assertEqual(
                 response.status_code, status.HTTP_201_CREATED, "Could not create test product"
@@ -92,6 +116,15 @@ class TestProductRoutes(TestCase):
             products.append(test_product)
         return products
 
+    def _bulk_create_products(self, count: int = 1) -> list:
+        """Factory method to insert products straight into the database"""
+        products = product_factory().build_batch(count)
+        for product in products:
+            product.id = None  # let the database assign the ids
+        db.session.bulk_save_objects(products, return_defaults=True)
+        db.session.commit()
+        return products
+
     ############################################################
     #  T E S T   C A S E S
     ############################################################
@@ -113,9 +146,10 @@ class TestProductRoutes(TestCase):
     # ----------------------------------------------------------
     def test_create_product(self):
         """It should Create a new Product"""
-        test_product = ProductFactory()
-        logging.debug("Test Product: %s", test_product.serialize())
-        response = self.client.post(BASE_URL, json=test_product.serialize())
+        test_product = product_factory().build()
+        payload = test_product.serialize()
+        logging.debug("Test Product: %s", payload)
+        response = self.client.post(BASE_URL, json=payload)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
         # Make sure location header is set
@@ -124,11 +158,18 @@ class TestProductRoutes(TestCase):
 
         # Check the data is correct
         new_product = response.get_json()
-        self.assertEqual(new_product["name"], test_product.name)
-        self.assertEqual(new_product["description"], test_product.description)
-        self.assertEqual(Decimal(new_product["price"]), test_product.price)
-        self.assertEqual(new_product["available"], test_product.available)
-        self.assertEqual(new_product["category"], test_product.category.name)
+        self.assertIsNotNone(new_product["id"])
+        new_product["price"] = Decimal(new_product["price"])
+        expected = (
+            ("name", test_product.name),
+            ("description", test_product.description),
+            ("price", test_product.price),
+            ("available", test_product.available),
+            ("category", test_product.category.name),
+        )
+        for key, value in expected:
+            with self.subTest(field=key):
+                self.assertEqual(new_product[key], value)
 
         #
         # Uncomment this code once READ is implemented
@@ -163,6 +204,35 @@ class TestProductRoutes(TestCase):
         response = self.client.post(BASE_URL, data={}, content_type="plain/text")
         self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
 
+    def test_reset_and_load_products(self):
+        """It should Replace all Products with the ones posted"""
+        self._bulk_create_products(2)
+        test_products = product_factory().build_batch(3)
+        response = self.client.post(
+            f"{BASE_URL}/_reset_and_load", json=[product.serialize() for product in test_products]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        data = self.client.get(BASE_URL).get_json()
+        self.assertEqual(len(data), 3)
+        self.assertEqual(
+            sorted(product["name"] for product in data),
+            sorted(product.name for product in test_products),
+        )
+
+    def test_reset_and_load_products_not_a_list(self):
+        """It should not Reset and Load Products from a single object"""
+        response = self.client.post(f"{BASE_URL}/_reset_and_load", json=PLAIN_PRODUCT.serialize())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_reset_and_load_products_not_enabled(self):
+        """It should not Reset and Load Products unless test endpoints are enabled"""
+        app.config["ENABLE_TEST_ENDPOINTS"] = False
+        try:
+            response = self.client.post(f"{BASE_URL}/_reset_and_load", json=[])
+        finally:
+            app.config["ENABLE_TEST_ENDPOINTS"] = True
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     #
     # ADD YOUR TEST CASES HERE
     #
@@ -171,26 +241,16 @@ class TestProductRoutes(TestCase):
     # Utility functions
     ######################################################################
 
-    # --- CREATE ---
-    def test_create_product(self):
-        prod = ProductFactory()
-        payload = prod.serialize()
-        response = self.app.post(BASE_URL, json=payload)
-        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        data = response.get_json()
-        self.assertIsNotNone(data["id"])
-        self.assertEqual(data["name"], prod.name)
-
     # --- READ ---
     def test_get_product(self):
         test_product = self._create_products(1)[0]
-        response = self.app.get(f"{BASE_URL}/{test_product.id}")
+        response = self.client.get(f"{BASE_URL}/{test_product.id}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = response.get_json()
         self.assertEqual(data["name"], test_product.name)
 
     def test_get_product_not_found(self):
-        response = self.app.get(f"{BASE_URL}/0")
+        response = self.client.get(f"{BASE_URL}/0")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         data = response.get_json()
         self.assertIn("not found", data["message"].lower())
@@ -198,20 +258,21 @@ class TestProductRoutes(TestCase):
     # --- UPDATE ---
     def test_update_product(self):
         # create
-        prod = ProductFactory()
-        response = self.app.post(BASE_URL, json=prod.serialize())
+        prod = product_factory().build()
+        payload = prod.serialize()
+        response = self.client.post(BASE_URL, json=payload)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         new_data = response.get_json()
         # update
         new_data["description"] = "updated-desc"
-        response = self.app.put(f"{BASE_URL}/{new_data['id']}", json=new_data)
+        response = self.client.put(f"{BASE_URL}/{new_data['id']}", json=new_data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         updated = response.get_json()
         self.assertEqual(updated["description"], "updated-desc")
 
     def test_update_product_not_found(self):
-        payload = ProductFactory().serialize()
-        response = self.app.put(f"{BASE_URL}/0", json=payload)
+        payload = PLAIN_PRODUCT.serialize()
+        response = self.client.put(f"{BASE_URL}/0", json=payload)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     # --- DELETE ---
@@ -219,54 +280,51 @@ class TestProductRoutes(TestCase):
         prods = self._create_products(3)
         count_before = self.get_product_count()
         target = prods[0]
-        response = self.app.delete(f"{BASE_URL}/{target.id}")
+        response = self.client.delete(f"{BASE_URL}/{target.id}")
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(self.get_product_count(), count_before - 1)
         # confirm 404 on read
-        response = self.app.get(f"{BASE_URL}/{target.id}")
+        response = self.client.get(f"{BASE_URL}/{target.id}")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     # --- LIST ALL ---
     def test_get_product_list(self):
-        self._create_products(5)
-        response = self.app.get(BASE_URL)
+        self._bulk_create_products(5)
+        response = self.client.get(BASE_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = response.get_json()
         self.assertEqual(len(data), 5)
 
     # --- FILTER BY NAME ---
     def test_query_by_name(self):
-        prods = self._create_products(5)
+        prods = self._bulk_create_products(10)
         test_name = prods[0].name
-        expected_count = sum(1 for p in prods if p.name == test_name)
+        expected_ids = {p.id for p in prods if p.name == test_name}
         qs = f"name={quote_plus(test_name)}"
-        response = self.app.get(f"{BASE_URL}?{qs}")
+        response = self.client.get(f"{BASE_URL}?{qs}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = response.get_json()
-        self.assertEqual(len(data), expected_count)
-        for item in data:
-            self.assertEqual(item["name"], test_name)
+        self.assertEqual({item["id"] for item in data}, expected_ids)
+        self.assertEqual({item["name"] for item in data}, {test_name})
 
     # --- FILTER BY CATEGORY ---
     def test_query_by_category(self):
-        prods = self._create_products(10)
+        prods = self._bulk_create_products(10)
         cat = prods[0].category
-        expected = [p for p in prods if p.category == cat]
+        expected_ids = {p.id for p in prods if p.category == cat}
         qs = f"category={cat.name}"
-        response = self.app.get(f"{BASE_URL}?{qs}")
+        response = self.client.get(f"{BASE_URL}?{qs}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = response.get_json()
-        self.assertEqual(len(data), len(expected))
-        for item in data:
-            self.assertEqual(item["category"], cat.name)
+        self.assertEqual({item["id"] for item in data}, expected_ids)
+        self.assertEqual({item["category"] for item in data}, {cat.name})
 
     # --- FILTER BY AVAILABILITY ---
     def test_query_by_availability(self):
-        prods = self._create_products(10)
-        expected = [p for p in prods if p.available]
-        response = self.app.get(f"{BASE_URL}?available=true")
+        prods = self._bulk_create_products(10)
+        expected_ids = {p.id for p in prods if p.available}
+        response = self.client.get(f"{BASE_URL}?available=true")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         data = response.get_json()
-        self.assertEqual(len(data), len(expected))
-        for item in data:
-            self.assertTrue(item["available"])
\ No newline at end of file
+        self.assertEqual({item["id"] for item in data}, expected_ids)
+        self.assertTrue(all(item["available"] for item in data))
\ No newline at end of file